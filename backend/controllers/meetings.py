@@ -1,51 +1,74 @@
 # backend/controllers/meetings.py
 
+import logging
+from datetime import timezone
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from uuid import uuid4
-from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from .. import models, schemas
-from ..services.zoom_service import create_zoom_meeting
+from ..services.zoom_service import create_zoom_meeting, delete_zoom_meeting
+from ..services.cache import cache_get, cache_set, invalidate_session
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/sessions/{session_id}/meetings",
     tags=["meetings"],
 )
 
+# Scheduled meetings are booked for an hour
+MEETING_MINUTES = 60
+
+_meetings_adapter = TypeAdapter(List[schemas.MeetingOut])
+
+# Built once; per request only the bound session id changes
+_MEETINGS_BY_SESSION = select(models.Meeting).where(models.Meeting.session_id == bindparam("sid"))
+
 @router.get("/", response_model=List[schemas.MeetingOut])
 async def list_meetings(
     session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     List all meetings for a session.
     """
-    sess = db.get(models.ClassSession, session_id)
-    if not sess:
-        raise HTTPException(status_code=404, detail="Session not found")
-    return sess.meetings
+    key = f"sessions:{session_id}:meetings"
+    body = await cache_get(key)
+    if body is None:
+        result = await db.execute(_MEETINGS_BY_SESSION, {"sid": session_id})
+        meetings = result.scalars().all()
+        # Only an empty result needs the extra lookup to tell "no meetings" from "no session"
+        if not meetings and not await db.scalar(select(exists().where(models.ClassSession.id == session_id))):
+            raise HTTPException(status_code=404, detail="Session not found")
+        body = _meetings_adapter.dump_json(_meetings_adapter.validate_python(meetings, from_attributes=True))
+        await cache_set(key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=schemas.MeetingOut)
 async def schedule_meeting(
     session_id: str,
     payload: schemas.MeetingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Schedule a new Zoom meeting and persist it.
     """
-    sess = db.get(models.ClassSession, session_id)
-    if not sess:
+    # Only the title is needed, so skip loading the whole session row
+    title = await db.scalar(select(models.ClassSession.title).where(models.ClassSession.id == session_id))
+    if title is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Create the Zoom meeting
     start = payload.scheduled_for
-    end = start + timedelta(hours=1)
-    zm = await create_zoom_meeting(sess.title, start, end)
+    # scheduled_for is a naive UTC column; asyncpg rejects aware datetimes for it
+    if start.tzinfo:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    zm = await create_zoom_meeting(title, start, MEETING_MINUTES)
 
     # Save to our database
     mid = str(zm["id"])
@@ -57,7 +80,19 @@ async def schedule_meeting(
         scheduled_for=start,
     )
     db.add(meeting)
-    db.commit()
-    db.refresh(meeting)
+    try:
+        await db.commit()
+    except Exception:
+        # Don't leave an orphaned meeting on Zoom that we have no record of
+        await db.rollback()
+        try:
+            await delete_zoom_meeting(mid)
+        except Exception:
+            # Keep the commit error as the one that propagates
+            logger.exception("Failed to delete orphaned Zoom meeting %s", mid)
+        raise
+    # Every MeetingOut field was assigned above and expire_on_commit is off,
+    # so the row isn't read back
+    await invalidate_session(session_id)
 
     return meeting
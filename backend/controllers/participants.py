@@ -1,31 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from uuid import uuid4
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from .. import models, schemas
 from ..database import get_db
-from ..services.email_service import send_email_with_ics
-from ..utils.ics_utils import build_placeholder_ics
+from ..services.email_service import send_bulk_emails_with_ics
+from ..services.cache import invalidate_session
+from ..utils.ics_utils import build_placeholder_ics_bytes
+from ..utils.ids import new_ids
 
 router = APIRouter(prefix="/sessions/{session_id}/participants", tags=["participants"])
 
+# Built once; each request only supplies the parameter rows
+_INSERT_PARTICIPANTS = insert(models.Participant)
+
 @router.post("/", response_model=List[schemas.ParticipantOut])
 async def add_participants(
     session_id: str,
     payload: schemas.ParticipantCreate,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db)
 ):
-    sess = db.query(models.ClassSession).get(session_id)
+    sess = await db.get(models.ClassSession, session_id)
     if not sess:
         raise HTTPException(404, "Session not found")
-    created = []
-    for email in payload.emails:
-        pid = str(uuid4())
-        p = models.Participant(id=pid, session_id=session_id, email=email, role=payload.role)
-        db.add(p)
-        created.append(p)
-    db.commit()
-    ics = build_placeholder_ics(session_id, sess.title, sess.description or "")
-    await send_email_with_ics([p.email for p in created], f"Invited to session: {sess.title}",
-                              f"You are invited to {sess.title}", ics, "session_invite.ics")
-    return created
\ No newline at end of file
+    if not payload.emails:
+        return []
+    # One batched INSERT instead of a flush per participant; the rows already
+    # hold everything ParticipantOut needs, so nothing is read back
+    rows = [
+        {"id": pid, "session_id": session_id, "email": email, "role": payload.role or "student"}
+        for pid, email in zip(new_ids(len(payload.emails)), payload.emails)
+    ]
+    await db.execute(_INSERT_PARTICIPANTS, rows)
+    await db.commit()
+    await invalidate_session(session_id)
+    ics = build_placeholder_ics_bytes(session_id, sess.title, sess.description or "")
+    # Invites go out after the response is sent; the DB commit is all the client waits on
+    background_tasks.add_task(send_bulk_emails_with_ics, [row["email"] for row in rows],
+                              f"Invited to session: {sess.title}", f"You are invited to {sess.title}",
+                              ics, "session_invite.ics")
+    return rows
\ No newline at end of file
@@ -1,132 +1,127 @@
-import os
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime, timedelta, timezone
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from azure.storage.blob.aio import BlobServiceClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from azure.storage.blob import generate_blob_sas, BlobSasPermissions
 
 from ..database import get_db
-from ..services.recording_service import list_recordings, store_recordings_to_azure, download_recordings_locally
+from ..services.recording_service import (
+    list_recordings,
+    list_stored_blobs,
+    store_recordings_to_azure,
+    download_recordings_locally,
+    with_access_token,
+)
+from ..services.cache import cache_get, cache_set
+from ..oauth_token import get_zoom_oauth_token
+from ..services.azure_client import ACCOUNT_KEY, ACCOUNT_NAME, CONN_STR, CONTAINER_NAME
 
 # Try matching the pattern of your other routers
 router = APIRouter(prefix="/sessions/{session_id}", tags=["recordings"])
 
-@router.get("/test")
-async def test_recordings_router(session_id: str):
-    """Test endpoint to verify routing works"""
-    return {"message": f"Recordings router working for session {session_id}"}
+RECORDINGS_TTL = 15
 
 @router.get("/recordings")
 async def get_recordings(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Return Zoom metadata only.
     """
-    try:
+    # Short-lived: the listing costs a Zoom call per meeting. The cached
+    # copy is token-free so the access token never lands in Redis; it is
+    # appended to the download URLs per response instead
+    key = f"sessions:{session_id}:recordings"
+    body = await cache_get(key)
+    if body is None:
         zoom_list = await list_recordings(session_id, db)
-        return {"recordings": zoom_list}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        await cache_set(key, orjson.dumps(zoom_list), ttl=RECORDINGS_TTL)
+    else:
+        zoom_list = orjson.loads(body)
+    # Already cached by the listing, so this is normally a lookup
+    token = await get_zoom_oauth_token()
+    for rec in zoom_list:
+        rec["download_url"] = with_access_token(rec["download_url"], token)
+    return {"recordings": zoom_list}
 
 @router.get("/recordings/stream_urls")
 async def get_stream_urls(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Generate SAS URLs for Azure-stored recordings so clients can stream them.
     Returns URLs matched to recording metadata.
     """
-    try:
-        conn_str = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-        if not conn_str:
-            raise HTTPException(status_code=500, detail="AZURE_STORAGE_CONNECTION_STRING not set")
+    if not CONN_STR:
+        raise HTTPException(status_code=500, detail="AZURE_STORAGE_CONNECTION_STRING not set")
+    if not ACCOUNT_NAME or not ACCOUNT_KEY:
+        raise HTTPException(status_code=500, detail="Invalid Azure storage connection string")
 
-        # Parse connection string for account and key
-        parts = dict(pair.split("=", 1) for pair in conn_str.split(";") if pair)
-        account_name = parts.get("AccountName")
-        account_key = parts.get("AccountKey")
-        if not account_name or not account_key:
-            raise HTTPException(status_code=500, detail="Invalid Azure storage connection string")
+    # Fetch Zoom metadata and list the stored blobs concurrently
+    recordings, stored = await asyncio.gather(
+        list_recordings(session_id, db),
+        list_stored_blobs(session_id),
+    )
 
-        # Get recording metadata first
-        recordings = await list_recordings(session_id, db)
-        
-        # If no recordings from Zoom, return empty
-        if not recordings:
-            return {"recordings_with_streams": []}
-        
-        # Async client for listing blobs
-        async with BlobServiceClient.from_connection_string(conn_str) as service:
-            container = service.get_container_client("recordings")
-            base_url = f"https://{account_name}.blob.core.windows.net/recordings"
-            
-            # Create a mapping of recording IDs to stream URLs
-            recording_streams = []
-            
-            for recording in recordings:
-                # Look for matching blob
-                blob_name = f"{session_id}/{recording['meeting_id']}/{recording['id']}.{recording['file_type'].lower()}"
-                
-                try:
-                    # Check if blob exists
-                    blob_client = container.get_blob_client(blob_name)
-                    await blob_client.get_blob_properties()
-                    
-                    # Generate SAS token
-                    sas = generate_blob_sas(
-                        account_name=account_name,
-                        container_name="recordings",
-                        blob_name=blob_name,
-                        account_key=account_key,
-                        permission=BlobSasPermissions(read=True),
-                        expiry=datetime.utcnow() + timedelta(hours=1)
-                    )
-                    
-                    stream_url = f"{base_url}/{blob_name}?{sas}"
-                    recording_streams.append({
-                        "recording_id": recording["id"],
-                        "meeting_id": recording["meeting_id"],
-                        "file_type": recording["file_type"],
-                        "stream_url": stream_url,
-                        "recording_start": recording["recording_start"],
-                        "recording_end": recording["recording_end"]
-                    })
-                except Exception:
-                    # Blob doesn't exist, skip
-                    continue
+    # If no recordings from Zoom, return empty
+    if not recordings:
+        return {"recordings_with_streams": []}
 
-        return {"recordings_with_streams": recording_streams}
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    base_url = f"https://{ACCOUNT_NAME}.blob.core.windows.net/{CONTAINER_NAME}"
+
+    # All URLs in one response share permission and expiry
+    permission = BlobSasPermissions(read=True)
+    expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    items = [
+        (recording, f"{session_id}/{recording['meeting_id']}/{recording['id']}.{recording['file_type'].lower()}")
+        for recording in recordings
+    ]
+
+    # Sign a per-blob SAS for each stored recording
+    recording_streams = [
+        {
+            "recording_id": recording["id"],
+            "meeting_id": recording["meeting_id"],
+            "file_type": recording["file_type"],
+            "stream_url": f"{base_url}/{blob_name}?" + generate_blob_sas(
+                account_name=ACCOUNT_NAME,
+                container_name=CONTAINER_NAME,
+                blob_name=blob_name,
+                account_key=ACCOUNT_KEY,
+                permission=permission,
+                expiry=expiry,
+            ),
+            "recording_start": recording["recording_start"],
+            "recording_end": recording["recording_end"]
+        }
+        for recording, blob_name in items
+        if blob_name in stored
+    ]
+
+    return {"recordings_with_streams": recording_streams}
 
 @router.post("/recordings/store")
 async def store_recordings(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Download Zoom recordings and upload them to Azure Blob Storage.
     """
-    try:
-        stored = await store_recordings_to_azure(session_id, db)
-        return {"stored": stored}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    stored = await store_recordings_to_azure(session_id, db)
+    return {"stored": stored}
 
 @router.post("/recordings/download")
 async def download_recordings(
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Download Zoom recordings to the local filesystem.
     """
-    try:
-        downloaded_files = await download_recordings_locally(session_id, db)
-        return {"downloaded_files": downloaded_files}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    downloaded_files = await download_recordings_locally(session_id, db)
+    return {"downloaded_files": downloaded_files}
\ No newline at end of file
@@ -1,35 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from uuid import uuid4
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from .. import models, schemas
 from ..database import get_db
+from ..utils.ids import new_id
+from ..services.cache import cache_get, cache_set, invalidate_session
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
+# Relationships serialized by SessionOut; must be loaded up front under AsyncSession
+_SESSION_LOAD = (
+    selectinload(models.ClassSession.participants),
+    selectinload(models.ClassSession.meetings),
+)
+_ALL_SESSIONS = select(models.ClassSession).options(*_SESSION_LOAD)
+
+# GET responses are cached as serialized JSON, so hits skip the DB and pydantic
+_session_adapter = TypeAdapter(schemas.SessionOut)
+_sessions_adapter = TypeAdapter(List[schemas.SessionOut])
+
+def _json(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
 @router.post("/", response_model=schemas.SessionOut)
-def create_session(payload: schemas.SessionCreate, db: Session = Depends(get_db)):
-    session_id = str(uuid4())
-    sess = models.ClassSession(id=session_id, title=payload.title, description=payload.description)
+async def create_session(payload: schemas.SessionCreate, db: AsyncSession = Depends(get_db)):
+    session_id = new_id()
+    # A new session has no children and a client-side created_at, so every
+    # SessionOut field is already in memory and no refresh is needed
+    sess = models.ClassSession(
+        id=session_id,
+        title=payload.title,
+        description=payload.description,
+        created_at=models.now(),
+        participants=[],
+        meetings=[],
+    )
     db.add(sess)
-    db.commit()
-    db.refresh(sess)
+    await db.commit()
+    await invalidate_session(session_id)
     return sess
 
 @router.get("/", response_model=list[schemas.SessionOut])
-def list_sessions(db: Session = Depends(get_db)):
-    return db.query(models.ClassSession).all()
+async def list_sessions(db: AsyncSession = Depends(get_db)):
+    key = "sessions:list"
+    body = await cache_get(key)
+    if body is None:
+        result = await db.execute(_ALL_SESSIONS)
+        sessions = _sessions_adapter.validate_python(result.scalars().all(), from_attributes=True)
+        body = _sessions_adapter.dump_json(sessions)
+        await cache_set(key, body)
+    return _json(body)
 
 @router.get("/{session_id}", response_model=schemas.SessionOut)
-def get_session(session_id: str, db: Session = Depends(get_db)):
-    sess = db.query(models.ClassSession).get(session_id)
-    if not sess:
-        raise HTTPException(404, "Session not found")
-    return sess
+async def get_session(session_id: str, db: AsyncSession = Depends(get_db)):
+    key = f"sessions:{session_id}"
+    body = await cache_get(key)
+    if body is None:
+        sess = await db.get(models.ClassSession, session_id, options=_SESSION_LOAD)
+        if not sess:
+            raise HTTPException(404, "Session not found")
+        body = _session_adapter.dump_json(_session_adapter.validate_python(sess, from_attributes=True))
+        await cache_set(key, body)
+    return _json(body)
 
 @router.delete("/{session_id}", status_code=204)
-def delete_session(session_id: str, db: Session = Depends(get_db)):
-    sess = db.query(models.ClassSession).get(session_id)
+async def delete_session(session_id: str, db: AsyncSession = Depends(get_db)):
+    sess = await db.get(models.ClassSession, session_id)
     if not sess:
         raise HTTPException(404, "Session not found")
-    db.delete(sess)
-    db.commit()
\ No newline at end of file
+    await db.delete(sess)
+    await db.commit()
+    await invalidate_session(session_id)
\ No newline at end of file
@@ -2,9 +2,10 @@ import os
 from pathlib import Path
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload
 
 # 1) Load the .env file sitting next to this module
 env_path = Path(__file__).parent / ".env"
@@ -15,19 +16,46 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL not set")
 
-# 3) Set up SQLAlchemy engine & session factory
-engine = create_engine(DATABASE_URL, connect_args={} if "sqlite" not in DATABASE_URL else {"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Point plain driver URLs at their async drivers
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+elif DATABASE_URL.startswith("sqlite://"):
+    DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+# 3) Set up SQLAlchemy async engine & session factory
+if "sqlite" in DATABASE_URL:
+    engine = create_async_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+else:
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_size=20,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+# Dev/test aid: turn any relationship load that isn't declared with a loader
+# option (selectinload etc.) into an error instead of a silent extra SELECT
+if os.getenv("SQL_RAISELOAD"):
+    @event.listens_for(Session, "do_orm_execute")
+    def _raise_on_lazy_load(state: ORMExecuteState):
+        if state.is_select:
+            state.statement = state.statement.options(raiseload("*", sql_only=True))
 
 # 4) Base class for your models
 Base = declarative_base()
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+async def init_db():
+    """
+    Create any missing tables. Only runs at startup when RUN_MIGRATIONS=1
+    is set, so do that for one process per deploy (e.g. a release step)
+    rather than on every worker; create_all never alters existing tables.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,38 +1,92 @@
-from fastapi import FastAPI
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .database import init_db
 from .controllers import sessions, participants, meetings, recordings
+from .services.azure_client import CONN_STR, close_azure_client, get_container
+from .services.http_client import close_http_session, get_http_session
+from .services.email_service import smtp_pool
+from .services.cache import REDIS_URL, close_cache
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-app = FastAPI(title="Zoom Live-Class Backend")
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Without Redis the cache lives in each process, so extra workers would serve
+    # stale data after another worker's write. uvicorn and gunicorn both take
+    # their worker count from WEB_CONCURRENCY; a bare --workers flag can't be seen here.
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 and not REDIS_URL:
+        raise RuntimeError("WEB_CONCURRENCY > 1 requires REDIS_URL for a shared cache")
+    # Schema creation is opt-in (RUN_MIGRATIONS=1) so regular workers skip the DDL round-trips
+    if os.getenv("RUN_MIGRATIONS") == "1":
+        await init_db()
+    if os.getenv("DEBUG_ROUTES"):
+        print("Available routes:")
+        for route in app.routes:
+            print(f"  {route.methods} {route.path}")
+    app.state.scheduler = AsyncIOScheduler()
+    app.state.scheduler.start()
+    app.state.http = get_http_session()
+    # Build the blob pipeline up front instead of on the first recordings request
+    if CONN_STR:
+        app.state.recordings_container = get_container()
+    yield
+    app.state.scheduler.shutdown()
+    await close_http_session()
+    await close_azure_client()
+    await smtp_pool.close()
+    await close_cache()
+
+app = FastAPI(
+    title="Zoom Live-Class Backend",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Single catch-all so handlers don't each wrap their body in try/except.
+# Registered before CORS so it sits inside it and its 500s carry CORS headers.
+@app.middleware("http")
+async def unhandled_exception_middleware(request: Request, call_next):
+    try:
+        return await call_next(request)
+    except Exception:
+        # Log the traceback here since ServerErrorMiddleware never sees it, and
+        # keep internal error text out of the response
+        logger.exception("unhandled error on %s %s", request.method, request.url.path)
+        return ORJSONResponse({"detail": "Internal Server Error"}, status_code=500)
+
+# Explicit lists keep preflight handling on Starlette's static-match path
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
-@app.on_event("startup")
-def on_startup():
-    init_db()
-    app.state.scheduler = AsyncIOScheduler()
-    app.state.scheduler.start()
-
-@app.on_event("shutdown")
-async def shutdown():
-    app.state.scheduler.shutdown()
-
 # Include routers - all without /api prefix to match your existing pattern
 app.include_router(sessions.router)
 app.include_router(participants.router)
 app.include_router(meetings.router)
 app.include_router(recordings.router)
 
-# Debug: Print all routes
-@app.on_event("startup")
-def print_routes():
-    print("Available routes:")
-    for route in app.routes:
-        print(f"  {route.methods} {route.path}")
\ No newline at end of file
+if __name__ == "__main__":
+    # uvloop (where available) + httptools; plain `uvicorn backend.main:app` also
+    # picks these up automatically once they're installed
+    import uvicorn
+    # One worker by default unless Redis backs the cache (see lifespan)
+    workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) if REDIS_URL else 1))
+    uvicorn.run(
+        "backend.main:app",
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=workers,
+    )
@@ -1,14 +1,19 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .database import Base
-from datetime import datetime
+from .utils.ids import new_id
+from datetime import datetime, timezone
 
 def now():
-    return datetime.utcnow()
+    # Columns are naive DateTime holding UTC; asyncpg rejects aware values for them
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+# Primary keys are indexed by the database already, so they don't set index=True.
+# Generated ids are time-ordered (see utils.ids) so new rows append to the index.
 
 class ClassSession(Base):
     __tablename__ = "class_sessions"
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True, default=new_id)
     title = Column(String, nullable=False)
     description = Column(String)
     created_at = Column(DateTime, default=now)
@@ -17,17 +22,23 @@ class ClassSession(Base):
 
 class Participant(Base):
     __tablename__ = "participants"
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True, default=new_id)
     session_id = Column(String, ForeignKey("class_sessions.id"))
     email = Column(String, nullable=False)
     role = Column(String, default="student")
     session = relationship("ClassSession", back_populates="participants")
 
+    # (session_id, id) lets per-session listings and deletes be answered from the index
+    __table_args__ = (Index("ix_participants_session_id", "session_id", "id"),)
+
 class Meeting(Base):
     __tablename__ = "meetings"
-    id = Column(String, primary_key=True, index=True)
+    id = Column(String, primary_key=True)
     uuid = Column(String, nullable=False)
     session_id = Column(String, ForeignKey("class_sessions.id"))
     join_url = Column(String, nullable=False)
     scheduled_for = Column(DateTime, nullable=False)
-    session = relationship("ClassSession", back_populates="meetings")
\ No newline at end of file
+    session = relationship("ClassSession", back_populates="meetings")
+
+    # Leading session_id also serves plain per-session lookups
+    __table_args__ = (Index("ix_meetings_session_scheduled", "session_id", "scheduled_for"),)
\ No newline at end of file
@@ -1,9 +1,13 @@
 import os
+import time
 import aiohttp
+import orjson
 import asyncio
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
+from .services.http_client import close_http_session, get_http_session
+
 # Load environment variables
 load_dotenv()
 
@@ -18,7 +22,30 @@ if not (CID and SEC and ACCTID):
         "Missing Zoom credentials: make sure client_id_Zoom, secret_zoom, and ZOOM_ACCOUNT_ID are set in your .env"
     )
 
+# Refresh this many seconds before Zoom says the token expires; recording
+# download URLs carry the token, and a transfer can run for minutes
+TOKEN_EXPIRY_MARGIN = 300
+
+_token_cache = {"token": None, "exp": 0.0}
+_token_lock = asyncio.Lock()
+
 async def get_zoom_oauth_token():
+    """
+    Returns a Zoom OAuth token, reusing the cached one until it is close
+    to expiry. Concurrent callers share a single refresh.
+    """
+    if _token_cache["token"] and time.monotonic() < _token_cache["exp"]:
+        return _token_cache["token"]
+    async with _token_lock:
+        # Another caller may have refreshed while we waited for the lock
+        if _token_cache["token"] and time.monotonic() < _token_cache["exp"]:
+            return _token_cache["token"]
+        data = await _fetch_zoom_oauth_token()
+        _token_cache["token"] = data.get("access_token")
+        _token_cache["exp"] = time.monotonic() + data.get("expires_in", 3600) - TOKEN_EXPIRY_MARGIN
+        return _token_cache["token"]
+
+async def _fetch_zoom_oauth_token() -> dict:
     """
     Fetches an OAuth token using Zoom account-level credentials
     """
@@ -29,19 +56,22 @@ async def get_zoom_oauth_token():
     }
     auth = aiohttp.BasicAuth(login=CID, password=SEC)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, params=params, auth=auth) as resp:
-            text = await resp.text()
-            if resp.status != 200:
-                # Raise HTTPException for FastAPI compatibility
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Zoom OAuth failed: {resp.status} {text}"
-                )
-            data = await resp.json()
-            return data.get("access_token")
+    async with get_http_session().post(url, params=params, auth=auth) as resp:
+        if resp.status != 200:
+            # Raise HTTPException for FastAPI compatibility; the body is only read for the error
+            raise HTTPException(
+                status_code=500,
+                detail=f"Zoom OAuth failed: {resp.status} {await resp.text()}"
+            )
+        return await resp.json(loads=orjson.loads)
 
 if __name__ == "__main__":
     # Quick CLI test
-    token = asyncio.run(get_zoom_oauth_token())
+    async def _main():
+        try:
+            return await get_zoom_oauth_token()
+        finally:
+            await close_http_session()
+
+    token = asyncio.run(_main())
     print("Zoom OAuth token:", token)
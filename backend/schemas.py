@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import datetime
 
 class SessionCreate(BaseModel):
@@ -18,16 +18,14 @@ class ParticipantOut(BaseModel):
     email: EmailStr
     role: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MeetingOut(BaseModel):
     id: str
     join_url: str
     scheduled_for: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SessionOut(BaseModel):
     id: str
@@ -37,5 +35,4 @@ class SessionOut(BaseModel):
     participants: List[ParticipantOut]
     meetings: List[MeetingOut]
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
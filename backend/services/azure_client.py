@@ -0,0 +1,51 @@
+import os
+from typing import Optional
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob.aio import BlobServiceClient, ContainerClient
+
+CONTAINER_NAME = "recordings"
+CONN_STR = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+
+# Parse the connection string once instead of on every request
+_parts = dict(pair.split("=", 1) for pair in CONN_STR.split(";") if pair) if CONN_STR else {}
+ACCOUNT_NAME = _parts.get("AccountName")
+ACCOUNT_KEY = _parts.get("AccountKey")
+
+# Sized for concurrent file uploads x staged blocks per file
+AZURE_MAX_CONNECTIONS = 32
+
+_service: Optional[BlobServiceClient] = None
+_container: Optional[ContainerClient] = None
+
+def get_container() -> ContainerClient:
+    """
+    Return the shared "recordings" container client, creating the
+    underlying BlobServiceClient (and its HTTP pipeline) on first use.
+    """
+    global _service, _container
+    if not CONN_STR:
+        raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING not set")
+    if _container is None:
+        # Own session rather than the Zoom one: azure-core expects to do
+        # content decoding itself (auto_decompress=False)
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=AZURE_MAX_CONNECTIONS,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            ),
+            auto_decompress=False,
+        )
+        _service = BlobServiceClient.from_connection_string(
+            CONN_STR, transport=AioHttpTransport(session=session, session_owner=True)
+        )
+        _container = _service.get_container_client(CONTAINER_NAME)
+    return _container
+
+async def close_azure_client() -> None:
+    global _service, _container
+    if _service is not None:
+        await _service.close()
+    _service = None
+    _container = None
@@ -0,0 +1,73 @@
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from redis import asyncio as aioredis
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Default lifetime of a cached GET response, in seconds
+DEFAULT_TTL = 30
+
+# In-process fallback used when REDIS_URL isn't configured. It is per-process,
+# so it is only safe with a single worker: invalidations in one worker never
+# reach another. The app refuses to start with WEB_CONCURRENCY > 1 and no
+# Redis, but `uvicorn --workers N` bypasses that check; set the count via WEB_CONCURRENCY.
+_MAX_LOCAL_ENTRIES = 1024
+_local: Dict[str, Tuple[float, bytes]] = {}
+
+_redis: Optional[aioredis.Redis] = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """
+    Return the cached JSON body for key, or None on a miss.
+    """
+    if _redis is not None:
+        return await _redis.get(key)
+    entry = _local.get(key)
+    if entry is None:
+        return None
+    expires, body = entry
+    if time.monotonic() >= expires:
+        _local.pop(key, None)
+        return None
+    return body
+
+async def cache_set(key: str, body: bytes, ttl: int = DEFAULT_TTL) -> None:
+    if _redis is not None:
+        await _redis.set(key, body, ex=ttl)
+        return
+    if len(_local) >= _MAX_LOCAL_ENTRIES:
+        now = time.monotonic()
+        for k in [k for k, (exp, _) in _local.items() if exp <= now]:
+            del _local[k]
+        if len(_local) >= _MAX_LOCAL_ENTRIES:
+            _local.clear()
+    _local[key] = (time.monotonic() + ttl, body)
+
+async def cache_delete(*keys: str) -> None:
+    if not keys:
+        return
+    if _redis is not None:
+        await _redis.delete(*keys)
+        return
+    for key in keys:
+        _local.pop(key, None)
+
+def session_keys(session_id: str) -> Tuple[str, ...]:
+    """
+    Every cached response that embeds data from the given session.
+    """
+    return (
+        "sessions:list",
+        f"sessions:{session_id}",
+        f"sessions:{session_id}:meetings",
+        f"sessions:{session_id}:recordings",
+    )
+
+async def invalidate_session(session_id: str) -> None:
+    await cache_delete(*session_keys(session_id))
+
+async def close_cache() -> None:
+    if _redis is not None:
+        await _redis.aclose()
@@ -1,41 +1,145 @@
+import asyncio
+import logging
 import os
-from typing import List
+from contextlib import asynccontextmanager
+from typing import List, Union
 from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
 import aiosmtplib
 
 # ← Fix import: go up from services/ into utils/
 from ..utils.ics_utils import build_placeholder_ics, build_meeting_ics
 
+logger = logging.getLogger(__name__)
+
 SMTP_HOST = os.getenv("SMTP_HOST")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
 EMAIL_FROM = os.getenv("EMAIL_FROM")
 
-async def send_email_with_ics(
-    to_emails: List[str],
+# Envelope recipients per message; most relays cap RCPT TO at 100
+RECIPIENTS_PER_MESSAGE = 50
+
+# Cap on concurrent SMTP sends (and so on open SMTP connections); keep it
+# under the relay's per-client connection limit
+MAX_CONCURRENT_SENDS = int(os.getenv("SMTP_MAX_CONNECTIONS", "14"))
+
+class SMTPPool:
+    """
+    Keeps logged-in SMTP connections around between sends, so each
+    message doesn't pay for its own connect + STARTTLS + AUTH + QUIT.
+    """
+
+    def __init__(self, max_size: int):
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: List[aiosmtplib.SMTP] = []
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(hostname=SMTP_HOST, port=SMTP_PORT, start_tls=True)
+        await client.connect()
+        if SMTP_USER:
+            await client.login(SMTP_USER, SMTP_PASS)
+        return client
+
+    @asynccontextmanager
+    async def acquire(self, fresh: bool = False):
+        async with self._slots:
+            client = self._idle.pop() if self._idle and not fresh else None
+            if client is not None:
+                # Health-check reused connections; servers drop idle sessions
+                try:
+                    await client.noop()
+                except aiosmtplib.SMTPException:
+                    client.close()
+                    client = None
+            if client is None:
+                client = await self._connect()
+            try:
+                yield client
+            finally:
+                if client.is_connected:
+                    self._idle.append(client)
+                else:
+                    client.close()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for client in idle:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+smtp_pool = SMTPPool(MAX_CONCURRENT_SENDS)
+
+# To header for messages whose recipients are only in the envelope
+_UNDISCLOSED = b"To: undisclosed-recipients:;\r\n"
+
+def _build_invite(
     subject: str,
     body: str,
-    ics_content: str,
-    ics_filename: str = "invite.ics"
-) -> None:
+    ics_content: Union[str, bytes],
+    ics_filename: str,
+) -> bytes:
+    """
+    Serialise the invite to its wire form (CRLF, MIME-encoded attachment).
+    The To header is left off so one payload can be reused for every batch.
+    """
     msg = EmailMessage()
     msg["From"] = EMAIL_FROM
-    msg["To"] = ", ".join(to_emails)
     msg["Subject"] = subject
     msg.set_content(body)
+    if isinstance(ics_content, str):
+        ics_content = ics_content.encode("utf-8")
     msg.add_attachment(
-        ics_content.encode("utf-8"),
+        ics_content,
         maintype="text",
         subtype="calendar",
         filename=ics_filename,
         params={"method": "REQUEST", "charset": "UTF-8"}
     )
-    await aiosmtplib.send(
-        msg,
-        hostname=SMTP_HOST,
-        port=SMTP_PORT,
-        username=SMTP_USER,
-        password=SMTP_PASS,
-        start_tls=True
+    return msg.as_bytes(policy=SMTP_POLICY)
+
+async def _send_raw(to_emails: List[str], payload: bytes) -> dict:
+    """
+    Send payload in one SMTP transaction; returns the recipients the
+    server refused (sendmail only raises when all of them are refused).
+    """
+    try:
+        async with smtp_pool.acquire() as client:
+            refused, _ = await client.sendmail(EMAIL_FROM, to_emails, payload)
+    except aiosmtplib.SMTPServerDisconnected:
+        # The server can drop a pooled connection between the health check
+        # and the send; the dead client isn't returned, so retry on a new one
+        async with smtp_pool.acquire(fresh=True) as client:
+            refused, _ = await client.sendmail(EMAIL_FROM, to_emails, payload)
+    return refused
+
+async def send_bulk_emails_with_ics(
+    to_emails: List[str],
+    subject: str,
+    body: str,
+    ics_content: Union[str, bytes],
+    ics_filename: str = "invite.ics"
+) -> None:
+    """
+    Send the same invite to many recipients without sharing addresses:
+    recipients go only in the SMTP envelope (like Bcc), so one MAIL/DATA
+    transaction covers a whole batch. Batches run concurrently through
+    the SMTP pool. Runs as a background task, so failures are logged
+    rather than raised.
+    """
+    # MIME-encode once for every batch
+    payload = _UNDISCLOSED + _build_invite(subject, body, ics_content, ics_filename)
+    batches = [to_emails[i:i + RECIPIENTS_PER_MESSAGE] for i in range(0, len(to_emails), RECIPIENTS_PER_MESSAGE)]
+    results = await asyncio.gather(
+        *(_send_raw(batch, payload) for batch in batches),
+        return_exceptions=True,
     )
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to send %r to %s: %s", subject, ", ".join(batch), result)
+        else:
+            for email, response in result.items():
+                logger.error("Failed to send %r to %s: %s", subject, email, response)
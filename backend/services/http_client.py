@@ -0,0 +1,31 @@
+from typing import Optional
+import aiohttp
+
+_session: Optional[aiohttp.ClientSession] = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the process-wide aiohttp session used for Zoom calls, so
+    connections (and their TLS handshakes) are pooled across requests.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                # Room for a request's listing + file fan-out alongside other
+                # requests' Zoom calls without queueing on api.zoom.us
+                limit_per_host=32,
+                ttl_dns_cache=600,
+                keepalive_timeout=75,
+            ),
+            # Requests carry their own auth headers; don't share cookies between them
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+    return _session
+
+async def close_http_session() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -1,162 +1,308 @@
+import asyncio
+import base64
+import logging
 import os
+from contextlib import asynccontextmanager, suppress
+from typing import Optional
+from urllib.parse import quote
+from uuid import uuid4
+
 import aiohttp
+import orjson
 import aiofiles
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from azure.storage.blob.aio import BlobServiceClient
-from azure.storage.blob import ContentSettings  # Added missing import
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from azure.storage.blob import BlobBlock, ContentSettings
+from azure.storage.blob.aio import BlobClient
 
 from ..oauth_token import get_zoom_oauth_token
 from ..models import ClassSession
+from .azure_client import get_container
+from .http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+# Recordings are piped to Azure in staged blocks of this size
+BLOCK_SIZE = 8 * 1024 * 1024
+STAGE_CONCURRENCY = 4
+# Local downloads are written to disk in chunks of this size
+WRITE_CHUNK_SIZE = 4 * 1024 * 1024
+# Recordings downloaded/uploaded at once per request
+FILE_CONCURRENCY = 4
+# Concurrent Zoom API calls per request, kept well under Zoom's rate limits
+ZOOM_API_CONCURRENCY = 10
+# Recordings can take far longer than aiohttp's default 5-minute total to
+# stream, so bound only the connect and the gap between reads
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120)
 
-def _ensure_session_exists(session_id: str, db: Session) -> ClassSession:
-    sess = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+async def _ensure_session_exists(session_id: str, db: AsyncSession) -> ClassSession:
+    sess = await db.get(ClassSession, session_id, options=[selectinload(ClassSession.meetings)])
     if not sess:
         raise HTTPException(status_code=404, detail="Session not found")
     return sess
 
-async def list_recordings(session_id: str, db: Session) -> list[dict]:
-    sess = _ensure_session_exists(session_id, db)
-    token = await get_zoom_oauth_token()
+async def _fetch_meeting_recordings(client: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                                    meeting_id: str, headers: dict):
+    url = f"https://api.zoom.us/v2/meetings/{meeting_id}/recordings"
+    async with sem, client.get(url, headers=headers) as resp:
+        if resp.status != 200:
+            return None
+        return await resp.json(loads=orjson.loads)
+
+async def list_recordings(session_id: str, db: AsyncSession, token: Optional[str] = None) -> list[dict]:
+    sess = await _ensure_session_exists(session_id, db)
+    if token is None:
+        token = await get_zoom_oauth_token()
     headers = {"Authorization": f"Bearer {token}"}
+    client = get_http_session()
+    # One listing call per meeting, overlapped on the shared connection pool
+    sem = asyncio.Semaphore(ZOOM_API_CONCURRENCY)
+    meeting_ids = [meet.id for meet in sess.meetings]
+    results = await asyncio.gather(
+        *(_fetch_meeting_recordings(client, sem, mid, headers) for mid in meeting_ids),
+        return_exceptions=True,
+    )
     out = []
-    async with aiohttp.ClientSession(headers=headers) as client:
-        for meet in sess.meetings:
-            url = f"https://api.zoom.us/v2/meetings/{meet.id}/recordings"
-            async with client.get(url) as resp:
-                if resp.status != 200:
-                    continue
-                data = await resp.json()
-                for f in data.get("recording_files", []):
-                    download_url = f"{f['download_url']}?access_token={token}"
-                    out.append({
-                        "meeting_id": meet.id,
-                        "id": f.get("id"),
-                        "file_type": f.get("file_type"),
-                        "download_url": download_url,
-                        "recording_start": f.get("recording_start"),
-                        "recording_end": f.get("recording_end"),
-                    })
+    for meeting_id, data in zip(meeting_ids, results):
+        # One unreachable meeting shouldn't fail the whole listing
+        if isinstance(data, BaseException):
+            logger.warning("Listing recordings for meeting %s failed: %s", meeting_id, data)
+            continue
+        if data is None:
+            continue
+        for f in data.get("recording_files", []):
+            # Kept token-free; our own downloads authenticate with a Bearer header
+            out.append({
+                "meeting_id": meeting_id,
+                "id": f.get("id"),
+                "file_type": f.get("file_type"),
+                "download_url": f["download_url"],
+                "recording_start": f.get("recording_start"),
+                "recording_end": f.get("recording_end"),
+            })
     return out
 
-async def store_recordings_to_azure(session_id: str, db: Session) -> list[dict]:
+def with_access_token(url: str, token: str) -> str:
+    """
+    Client-facing form of a Zoom download URL, which has to carry the token
+    in the query string since browsers can't send our Authorization header.
+    """
+    sep = "&" if "?" in url else "?"
+    return f"{url}{sep}access_token={quote(token, safe='')}"
+
+@asynccontextmanager
+async def _open_recording(client: aiohttp.ClientSession, url: str, token: str):
+    """
+    Yield the download response for a recording, authenticated with the
+    account's OAuth token as Zoom documents for server-to-server apps.
+    Yields None (and logs the status) when Zoom refuses the download.
+    """
+    async with client.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=DOWNLOAD_TIMEOUT) as dl:
+        if dl.status != 200:
+            logger.warning("Zoom refused recording download (%s): %s", dl.status, url.split("?", 1)[0])
+            yield None
+            return
+        yield dl
+
+async def _stream_to_blob(
+    resp: aiohttp.ClientResponse,
+    blob_client: BlobClient,
+    content_settings: ContentSettings,
+) -> int:
+    """
+    Stream a download into Azure as staged blocks, so memory stays at a
+    few blocks regardless of the recording size. Returns the byte count.
+    """
+    sem = asyncio.Semaphore(STAGE_CONCURRENCY)
+    block_ids: list[str] = []
+    pending: list[asyncio.Task] = []
+    buffer = bytearray()
+    size = 0
+
+    async def _stage(block_id: str, chunk: bytes) -> None:
+        try:
+            await blob_client.stage_block(block_id, chunk)
+        finally:
+            sem.release()
+
+    async def _flush(chunk: bytes) -> None:
+        # Acquiring before spawning caps in-flight blocks (and memory)
+        await sem.acquire()
+        block_id = base64.b64encode(uuid4().bytes).decode()
+        block_ids.append(block_id)
+        pending.append(asyncio.create_task(_stage(block_id, chunk)))
+
+    try:
+        async for chunk in resp.content.iter_chunked(BLOCK_SIZE):
+            size += len(chunk)
+            buffer += chunk
+            if len(buffer) >= BLOCK_SIZE:
+                await _flush(bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await _flush(bytes(buffer))
+        await asyncio.gather(*pending)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        raise
+
+    if block_ids:
+        await blob_client.commit_block_list(
+            [BlobBlock(block_id=b) for b in block_ids],
+            content_settings=content_settings,
+        )
+    return size
+
+async def list_stored_blobs(session_id: str) -> dict[str, int]:
+    """
+    Size of every blob already uploaded for a session, from one prefix
+    listing. Blobs only appear once commit_block_list succeeds, so a
+    listed blob is a complete upload.
+    """
+    container = get_container()
+    return {
+        blob.name: blob.size
+        async for blob in container.list_blobs(name_starts_with=f"{session_id}/", results_per_page=5000)
+    }
+
+def _completed(recs: list[dict], results: list) -> list:
+    """
+    Keep the files that transferred; a failed file is logged and skipped
+    rather than discarding the rest of the batch.
+    """
+    done = []
+    for rec, result in zip(recs, results):
+        if isinstance(result, BaseException):
+            logger.warning("Transfer of recording %s of meeting %s failed: %s", rec["id"], rec["meeting_id"], result)
+        elif result is not None:
+            done.append(result)
+    return done
+
+async def _store_one(
+    sem: asyncio.Semaphore,
+    client: aiohttp.ClientSession,
+    container,
+    session_id: str,
+    rec: dict,
+    token: str,
+    existing: dict[str, int],
+) -> Optional[dict]:
+    # Determine MIME type from extension
+    ext = rec["file_type"].lower()
+    if ext == "mp4":
+        ctype = "video/mp4"
+    elif ext in ("m4a", "mp3"):
+        ctype = "audio/mp4"
+    elif ext == "wav":
+        ctype = "audio/wav"
+    else:
+        ctype = "application/octet-stream"
+
+    blob_name = f"{session_id}/{rec['meeting_id']}/{rec['id']}.{ext}"
+    # Re-runs skip files that already made it to Azure instead of re-downloading them
+    file_size = existing.get(blob_name)
+    if file_size is None:
+        blob_client = container.get_blob_client(blob_name)
+        async with sem, _open_recording(client, rec["download_url"], token) as dl:
+            if dl is None:
+                return None
+            # Pipe the download into staged blocks with proper Content-Type
+            file_size = await _stream_to_blob(
+                dl,
+                blob_client,
+                ContentSettings(content_type=ctype, content_disposition="inline"),
+            )
+        if not file_size:
+            return None
+        logger.debug("Stored %s (%d bytes)", blob_name, file_size)
+
+    return {
+        "meeting_id": rec["meeting_id"],
+        "file_id": rec["id"],
+        "blob_path": blob_name,
+        "file_size": file_size
+    }
+
+async def store_recordings_to_azure(session_id: str, db: AsyncSession) -> list[dict]:
     """
     Download Zoom recordings and upload them to Azure Blob Storage,
     setting the appropriate Content-Type on each blob.
     """
-    recs = await list_recordings(session_id, db)
+    # One token for both the listing and the downloads
+    token = await get_zoom_oauth_token()
+    recs = await list_recordings(session_id, db, token)
     if not recs:
         raise HTTPException(status_code=404, detail="No recordings to upload")
 
-    conn_str = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-    if not conn_str:
-        raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING not set")
-    service = BlobServiceClient.from_connection_string(conn_str)
-    container = service.get_container_client("recordings")
+    container = get_container()
+    client = get_http_session()
+    existing = await list_stored_blobs(session_id)
 
-    stored = []
-    token = await get_zoom_oauth_token()
-    headers = {"Authorization": f"Bearer {token}"}
+    # Several files stream at once; each also stages its blocks concurrently
+    sem = asyncio.Semaphore(FILE_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_store_one(sem, client, container, session_id, rec, token, existing) for rec in recs),
+        return_exceptions=True,
+    )
+    return _completed(recs, results)
 
-    async with aiohttp.ClientSession(headers=headers) as client:
-        for rec in recs:
-            url = rec["download_url"]
-            content = None
-
-            # Try bearer header
-            async with client.get(url) as dl:
-                if dl.status == 200:
-                    content = await dl.read()
-
-            # Try token param
-            if content is None:
-                async with client.get(f"{url}?download_access_token={token}") as dl2:
-                    if dl2.status == 200:
-                        content = await dl2.read()
-
-            # Try no-auth
-            if content is None:
-                async with aiohttp.ClientSession() as no_auth:
-                    async with no_auth.get(url) as dl3:
-                        if dl3.status == 200:
-                            content = await dl3.read()
-
-            if not content:
-                continue
-
-            # Determine MIME type from extension
-            ext = rec["file_type"].lower()
-            if ext == "mp4":
-                ctype = "video/mp4"
-            elif ext in ("m4a", "mp3"):
-                ctype = "audio/mp4"
-            elif ext == "wav":
-                ctype = "audio/wav"
-            else:
-                ctype = "application/octet-stream"
-
-            blob_name = f"{session_id}/{rec['meeting_id']}/{rec['id']}.{ext}"
-            blob_client = container.get_blob_client(blob_name)
-
-            # Upload with proper Content-Type
-            await blob_client.upload_blob(
-                content,
-                overwrite=True,
-                content_settings=ContentSettings(content_type="video/mp4",
-                content_disposition="inline")
-            )
-
-            stored.append({
-                "meeting_id": rec["meeting_id"],
-                "file_id": rec["id"],
-                "blob_path": blob_name,
-                "file_size": len(content)
-            })
+async def _download_one(
+    sem: asyncio.Semaphore,
+    client: aiohttp.ClientSession,
+    base_dir: str,
+    rec: dict,
+    token: str,
+) -> Optional[str]:
+    async with sem, _open_recording(client, rec["download_url"], token) as dl:
+        if dl is None:
+            return None
+        meet_dir = os.path.join(base_dir, str(rec["meeting_id"]))
+        os.makedirs(meet_dir, exist_ok=True)
+        ext = rec["file_type"].lower()
+        outpath = os.path.join(meet_dir, f"{rec['id']}.{ext}")
+        # Write to a .part file and move it into place only after a full
+        # read, so a failed transfer never leaves a truncated recording.
+        # Network reads are often far smaller than WRITE_CHUNK_SIZE, so
+        # coalesce them to keep aiofiles' thread hand-offs per write low
+        partpath = outpath + ".part"
+        size = 0
+        buffer = bytearray()
+        try:
+            async with aiofiles.open(partpath, "wb") as f:
+                async for chunk in dl.content.iter_chunked(WRITE_CHUNK_SIZE):
+                    size += len(chunk)
+                    buffer += chunk
+                    if len(buffer) >= WRITE_CHUNK_SIZE:
+                        await f.write(bytes(buffer))
+                        buffer.clear()
+                if buffer:
+                    await f.write(bytes(buffer))
+            if not size:
+                os.remove(partpath)
+                return None
+            os.replace(partpath, outpath)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(partpath)
+            raise
+    logger.debug("Saved %s (%d bytes)", outpath, size)
+    return outpath
 
-    return stored
-
-async def download_recordings_locally(session_id: str, db: Session) -> list[str]:
-    recs = await list_recordings(session_id, db)
+async def download_recordings_locally(session_id: str, db: AsyncSession) -> list[str]:
+    token = await get_zoom_oauth_token()
+    recs = await list_recordings(session_id, db, token)
     if not recs:
         raise HTTPException(status_code=404, detail="No recordings to download")
 
     base_dir = os.path.join(os.getcwd(), "recordings", session_id)
     os.makedirs(base_dir, exist_ok=True)
-    token = await get_zoom_oauth_token()
-    saved = []
-
-    async with aiohttp.ClientSession() as client:
-        for rec in recs:
-            url = rec["download_url"]
-            data = None
-
-            # 1) Bearer header
-            async with client.get(url, headers={"Authorization": f"Bearer {token}"}, allow_redirects=True) as r1:
-                if r1.status == 200:
-                    data = await r1.read()
-
-            # 2) token param
-            if data is None:
-                async with client.get(f"{url}?download_access_token={token}", allow_redirects=True) as r2:
-                    if r2.status == 200:
-                        data = await r2.read()
-
-            # 3) no auth
-            if data is None:
-                async with aiohttp.ClientSession() as no_auth:
-                    async with no_auth.get(url, allow_redirects=True) as r3:
-                        if r3.status == 200:
-                            data = await r3.read()
-
-            if not data:
-                continue
-
-            meet_dir = os.path.join(base_dir, str(rec["meeting_id"]))
-            os.makedirs(meet_dir, exist_ok=True)
-            ext = rec["file_type"].lower()
-            outpath = os.path.join(meet_dir, f"{rec['id']}.{ext}")
-            async with aiofiles.open(outpath, "wb") as f:
-                await f.write(data)
-            saved.append(outpath)
-
-    return saved
\ No newline at end of file
+    client = get_http_session()
+
+    sem = asyncio.Semaphore(FILE_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_download_one(sem, client, base_dir, rec, token) for rec in recs),
+        return_exceptions=True,
+    )
+    return _completed(recs, results)
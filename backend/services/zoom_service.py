@@ -1,25 +1,31 @@
 # backend/services/zoom_service.py
 
 import os
+from datetime import datetime
+
 import aiohttp
-from datetime import datetime, timedelta
+import orjson
 
 # ← fix: import from the parent package
 from ..oauth_token import get_zoom_oauth_token  
 from ..utils.ics_utils import build_meeting_ics
+from .http_client import get_http_session
 
 ZOOM_USER_ID = os.getenv("ZOOM_USER_ID")
 if not ZOOM_USER_ID:
     raise RuntimeError("ZOOM_USER_ID not set in environment")
 
-async def create_zoom_meeting(subject: str, start: datetime, end: datetime) -> dict:
+# Upper bound on a single Zoom API call, so a stalled request can't hold a worker
+ZOOM_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+async def create_zoom_meeting(subject: str, start: datetime, duration_minutes: int = 60) -> dict:
     token = await get_zoom_oauth_token()
     url = f"https://api.zoom.us/v2/users/{ZOOM_USER_ID}/meetings"
     payload = {
         "topic": subject,
         "type": 2,
         "start_time": start.isoformat(),
-        "duration": int((end - start).total_seconds() / 60),
+        "duration": duration_minutes,
         "timezone": "UTC",
         "settings": {"auto_recording": "cloud"}
     }
@@ -27,7 +33,19 @@ async def create_zoom_meeting(subject: str, start: datetime, end: datetime) -> d
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload, headers=headers) as resp:
+    async with get_http_session().post(url, json=payload, headers=headers, timeout=ZOOM_TIMEOUT) as resp:
+        resp.raise_for_status()
+        return await resp.json(loads=orjson.loads)
+
+async def delete_zoom_meeting(meeting_id: str) -> None:
+    """
+    Delete a Zoom meeting; used to undo create_zoom_meeting when the
+    meeting can't be saved on our side. A meeting that is already gone
+    counts as deleted.
+    """
+    token = await get_zoom_oauth_token()
+    url = f"https://api.zoom.us/v2/meetings/{meeting_id}"
+    headers = {"Authorization": f"Bearer {token}"}
+    async with get_http_session().delete(url, headers=headers, timeout=ZOOM_TIMEOUT) as resp:
+        if resp.status != 404:
             resp.raise_for_status()
-            return await resp.json()
@@ -0,0 +1,53 @@
+# backend/tests/test_meetings.py
+
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/test.db")
+os.environ.setdefault("client_id_Zoom", "test")
+os.environ.setdefault("secret_zoom", "test")
+os.environ.setdefault("ZOOM_ACCOUNT_ID", "test")
+os.environ.setdefault("ZOOM_USER_ID", "me")
+os.environ.setdefault("RUN_MIGRATIONS", "1")
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from backend import models
+from backend.controllers import meetings
+from backend.database import SessionLocal
+from backend.main import app
+
+
+def test_schedule_meeting_stores_aware_time_as_naive_utc(monkeypatch):
+    seen = {}
+
+    async def fake_create_zoom_meeting(subject, start, duration_minutes=60):
+        seen["start"] = start
+        return {"id": 42, "uuid": "u-42", "join_url": "https://zoom.example/j/42"}
+
+    monkeypatch.setattr(meetings, "create_zoom_meeting", fake_create_zoom_meeting)
+
+    with TestClient(app) as client:
+        sid = client.post("/sessions/", json={"title": "Algebra"}).json()["id"]
+        r = client.post(
+            f"/sessions/{sid}/meetings/",
+            json={"scheduled_for": "2026-01-01T10:00:00Z"},
+        )
+        assert r.status_code == 200, r.text
+
+        async def stored():
+            async with SessionLocal() as db:
+                return await db.scalar(
+                    select(models.Meeting.scheduled_for).where(models.Meeting.id == "42")
+                )
+
+        value = client.portal.call(stored)
+
+    expected = datetime(2026, 1, 1, 10, 0, 0)
+    assert seen["start"] == expected
+    assert value == expected
+    assert value.tzinfo is None
@@ -1,42 +1,89 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
-def build_placeholder_ics(session_id: str, title: str, description: str):
-    now_dt = datetime.utcnow()
-    uid = f"{session_id}@live-classes"
+# RFC 5545 content lines end in CRLF; only the per-event fields vary
+_ICS_HEAD = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Live Classes//EN\r\n"
+    "METHOD:REQUEST\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:{uid}\r\n"
+)
+_ICS_TIMES = (
+    "DTSTAMP:{dtstamp}\r\n"
+    "DTSTART:{dtstart}\r\n"
+    "DTEND:{dtend}\r\n"
+)
+_ICS_SUMMARY = "SUMMARY:{summary}\r\n"
+_ICS_HEADER = _ICS_HEAD + _ICS_TIMES + _ICS_SUMMARY
+_ICS_FOOTER = (
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+PLACEHOLDER_ICS_TEMPLATE = _ICS_HEADER + _ICS_FOOTER
+MEETING_ICS_TEMPLATE = (
+    _ICS_HEADER
+    + "DESCRIPTION:{description}\r\n"
+    + "LOCATION:{location}\r\n"
+    + _ICS_FOOTER
+)
+
+def _ics_ts(dt: datetime) -> str:
+    # UTC "basic" form, e.g. 20250101T093000Z; cheaper than strftime for a fixed format
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}T{dt.hour:02d}{dt.minute:02d}{dt.second:02d}Z"
+
+def _ics_text(value: str) -> str:
+    # Escape TEXT property values (RFC 5545 section 3.3.11)
     return (
-        "BEGIN:VCALENDAR\n"
-        "VERSION:2.0\n"
-        "PRODID:-//Live Classes//EN\n"
-        "METHOD:REQUEST\n"
-        "BEGIN:VEVENT\n"
-        f"UID:{uid}\n"
-        f"DTSTAMP:{now_dt.strftime('%Y%m%dT%H%M%SZ')}\n"
-        f"DTSTART:{now_dt.strftime('%Y%m%dT%H%M%SZ')}\n"
-        f"DTEND:{(now_dt + timedelta(hours=1)).strftime('%Y%m%dT%H%M%SZ')}\n"
-        f"SUMMARY:{title} (not yet scheduled)\n"
-        "END:VEVENT\n"
-        "END:VCALENDAR"
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
     )
 
+def _placeholder_times() -> dict:
+    # Stamped at build time, so every batch of invites gets a current DTSTAMP
+    now_dt = datetime.now(timezone.utc)
+    dtstamp = _ics_ts(now_dt)
+    return {
+        "dtstamp": dtstamp,
+        "dtstart": dtstamp,
+        "dtend": _ics_ts(now_dt + timedelta(hours=1)),
+    }
+
+def build_placeholder_ics(session_id: str, title: str, description: str):
+    return PLACEHOLDER_ICS_TEMPLATE.format(
+        uid=f"{session_id}@live-classes",
+        summary=_ics_text(f"{title} (not yet scheduled)"),
+        **_placeholder_times(),
+    )
+
+# Only the timestamp-free lines are cached, keyed on (session_id, title) so an
+# edited title gets a fresh entry
+@lru_cache(maxsize=1024)
+def _placeholder_ics_parts(session_id: str, title: str) -> tuple[bytes, bytes]:
+    head = _ICS_HEAD.format(uid=f"{session_id}@live-classes")
+    tail = _ICS_SUMMARY.format(summary=_ics_text(f"{title} (not yet scheduled)")) + _ICS_FOOTER
+    return head.encode("utf-8"), tail.encode("utf-8")
+
+def build_placeholder_ics_bytes(session_id: str, title: str, description: str) -> bytes:
+    # UTF-8 form for email attachments; the cached parts are joined around
+    # freshly stamped DTSTAMP/DTSTART/DTEND lines
+    head, tail = _placeholder_ics_parts(session_id, title)
+    return head + _ICS_TIMES.format(**_placeholder_times()).encode("ascii") + tail
+
 
 def build_meeting_ics(meeting_id: str, title: str, description: str, join_url: str, start: datetime):
-    dtstamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    dtstart = start.strftime("%Y%m%dT%H%M%SZ")
-    dtend = (start + timedelta(hours=1)).strftime("%Y%m%dT%H%M%SZ")
-    uid = f"{meeting_id}@live-classes"
-    return (
-        "BEGIN:VCALENDAR\n"
-        "VERSION:2.0\n"
-        "PRODID:-//Live Classes//EN\n"
-        "METHOD:REQUEST\n"
-        "BEGIN:VEVENT\n"
-        f"UID:{uid}\n"
-        f"DTSTAMP:{dtstamp}\n"
-        f"DTSTART:{dtstart}\n"
-        f"DTEND:{dtend}\n"
-        f"SUMMARY:{title}\n"
-        f"DESCRIPTION:Join Zoom Meeting: {join_url}\n\n{description}\n"
-        f"LOCATION:{join_url}\n"
-        "END:VEVENT\n"
-        "END:VCALENDAR"
-    )
\ No newline at end of file
+    return MEETING_ICS_TEMPLATE.format(
+        uid=f"{meeting_id}@live-classes",
+        dtstamp=_ics_ts(datetime.now(timezone.utc)),
+        dtstart=_ics_ts(start),
+        dtend=_ics_ts(start + timedelta(hours=1)),
+        summary=_ics_text(title),
+        description=_ics_text(f"Join Zoom Meeting: {join_url}\n\n{description}"),
+        location=_ics_text(join_url),
+    )